@@ -1,19 +1,15 @@
 __author__ = 'Frederik Diehl'
 
-from apsis.models.experiment import Experiment
 from apsis.models.candidate import Candidate
 from apsis.utilities.optimizer_utils import check_optimizer
-from apsis.utilities.file_utils import ensure_directory_exists
+from apsis.utilities.file_utils import write_json
+from apsis.utilities.step_utils import running_best
+from collections import deque
 import numpy as np
-import datetime
 import os
-import time
 from apsis.utilities.logging_utils import get_logger
-from apsis.utilities.plot_utils import plot_lists, write_plot_to_file
-import matplotlib.pyplot as plt
-import json
 
-AVAILABLE_STATUS = ["finished", "pausing", "working"]
+AVAILABLE_STATUS = frozenset(["finished", "pausing", "working"])
 
 
 class ExperimentAssistant(object):
@@ -32,25 +28,83 @@ class ExperimentAssistant(object):
         an apsis.optimizers.optimizer.Optimizer instance.
     _optimizer_arguments : dict
         Dictionary of the arguments for optimizer.
+    _prefetch : int
+        The number of candidates requested from the optimizer at once. Set by
+        the "prefetch" optimizer argument, default 1.
+    _prefetched : deque of Candidates
+        Candidates requested from the optimizer but not yet handed out. They
+        are discarded once a candidate finishes, since the optimizer will
+        then propose better ones - unless the optimizer's
+        invalidates_on_finish is False.
     _experiment : Experiment
         The experiment storing the evaluated points and parameter definition.
+    _status_handlers : dict
+        Maps each status in AVAILABLE_STATUS to the function applying an
+        update with that status to the experiment.
     _write_dir : basestring
         Directory containing the checkpoints.
+    _assistant_state_path : basestring
+        The file the state of this assistant is written to, or None if
+        _write_dir is None.
+    _write_frequency : int
+        The number of changes after which the experiment is written to file.
+    _unwritten_changes : int
+        The number of changes since the experiment was last written.
+    _plot_options : dict
+        The fig_options used by plot_result_per_step. They only depend on the
+        experiment, and are therefore computed once.
+    _plot_figure : matplotlib.figure or None
+        The figure plot_result_per_step draws to if no ax is given. It is
+        created on the first such call and reused afterwards, instead of
+        creating (and leaking) a new figure on every call.
+    _candidates_cache : dict or None
+        The result of the last get_candidates call, or None if the candidates
+        have changed since.
+    _experiment_dict_cache : dict or None
+        The result of the last get_experiment_as_dict call, or None if the
+        candidates have changed since.
+    _step_x : list of ints
+        The step of each finished candidate, that is [0, ..., n-1].
+    _step_evaluation : list of floats
+        The result of each finished candidate, in order. NaN for failed ones.
+    _step_best : list of floats
+        The best result found up to and including each finished candidate.
+        NaN as long as no candidate has succeeded.
+    _step_removals : int
+        The experiment's finished_removals when the step lists were started.
+        If it differs, candidates_finished has been reordered and the lists
+        are rebuilt.
     _logger : logger
         The logger instance for this class.
     """
 
     _optimizer = None
     _optimizer_arguments = None
+    _prefetch = None
+    _prefetched = None
     _experiment = None
+    _status_handlers = None
 
     _write_dir = None
+    _assistant_state_path = None
+    _write_frequency = None
+    _unwritten_changes = None
+
+    _plot_options = None
+    _plot_figure = None
+    _candidates_cache = None
+    _experiment_dict_cache = None
+
+    _step_x = None
+    _step_evaluation = None
+    _step_best = None
+    _step_removals = None
 
     _logger = None
 
     def __init__(self, optimizer_class, experiment,
                  optimizer_arguments=None,
-                 write_dir=None):
+                 write_dir=None, write_frequency=1):
         """
         Initializes this experiment assistant.
 
@@ -69,36 +123,85 @@ class ExperimentAssistant(object):
             written to. If this is None (default), no state will be written.
         optimizer_arguments : dict, optional
             The dictionary of optimizer arguments. If None, default values will
-            be used.
+            be used. Supports the additional argument "prefetch", the number of
+            candidates to request from the optimizer at once (default 1). It
+            has to be an int of at least 1.
+        write_frequency : int, optional
+            The experiment is written to write_dir after every write_frequency
+            changes (and on exit, or when calling flush). Default is 1, which
+            writes after every change.
+
+        Raises
+        ------
+        ValueError :
+            Iff prefetch is not an int of at least 1.
         """
         self._logger = get_logger(self, extra_info="exp_id: " +
                                                    str(experiment.exp_id))
         self._logger.info("Initializing experiment assistant.")
         self._optimizer = optimizer_class
         self._optimizer_arguments = optimizer_arguments
+        self._prefetch = (optimizer_arguments or {}).get("prefetch", 1)
+        if not isinstance(self._prefetch, (int, long)) or self._prefetch < 1:
+            message = ("prefetch must be an int of at least 1, not %s."
+                       %(self._prefetch,))
+            self._logger.error(message)
+            raise ValueError(message)
+        self._prefetched = deque()
         self._write_dir = write_dir
+        self._write_frequency = write_frequency
+        self._unwritten_changes = 0
         self._experiment = experiment
+        self._status_handlers = {"finished": self._add_finished,
+                                 "pausing": experiment.add_pausing,
+                                 "working": experiment.add_working}
+        self._reset_steps()
+        if write_dir is not None:
+            self._assistant_state_path = os.path.join(write_dir,
+                                                      'exp_assistant.json')
+        self._init_plot_options()
         self._init_optimizer()
-        self._write_state_to_file()
+        self._write_assistant_state()
+        self.flush()
         self._logger.info("Experiment assistant successfully initialized.")
 
+    def _init_plot_options(self):
+        """
+        Initializes the plot options used by plot_result_per_step.
+        """
+        if self._experiment.minimization_problem:
+            legend_loc = 'upper right'
+        else:
+            legend_loc = 'upper left'
+        self._logger.debug("Setting legend to %s LOC", legend_loc)
+        self._plot_options = {
+            "legend_loc": legend_loc,
+            "x_label": "steps",
+            "y_label": "result",
+            "title": "Plot of %s result over the steps."
+                     % (str(self._experiment.name)),
+            "minimizing": self._experiment.minimization_problem
+        }
+        self._logger.debug("Plot options are %s", self._plot_options)
+
     def _init_optimizer(self):
         """
         Initializes the optimizer if it does not exist.
         """
-        self._logger.debug("Initializing optimizer. Current state is %s"
-                           %self._optimizer)
+        self._logger.debug("Initializing optimizer. Current state is %s",
+                           self._optimizer)
         self._optimizer= check_optimizer(self._optimizer, self._experiment,
             optimizer_arguments=self._optimizer_arguments)
-        self._logger.debug("Initialized optimizer. State afterwards is %s"
-                           %self._optimizer)
+        self._logger.debug("Initialized optimizer. State afterwards is %s",
+                           self._optimizer)
 
     def get_next_candidate(self):
         """
         Returns the Candidate next to evaluate.
 
-        Internally, it first tries to return the most recent pending candidate
-        of this experiment. If there is none, it generates one from optimizer.
+        Internally, it first tries to return the oldest pending candidate
+        of this experiment. If there is none, it returns one prefetched from
+        the optimizer, requesting _prefetch new ones if necessary.
 
         Returns
         -------
@@ -108,23 +211,27 @@ class ExperimentAssistant(object):
         """
 
         self._logger.debug("Returning next candidate.")
+        self._candidates_cache = None
+        self._experiment_dict_cache = None
         to_return = None
         if not self._experiment.candidates_pending:
-            self._logger.debug("No candidate pending; requesting one from "
-                               "optimizer.")
-            candidates = self._optimizer.get_next_candidates(num_candidates=1)
-            self._logger.debug("Got %s", [str(c) for c in candidates])
-            if candidates is None:
-                to_return = None
-            elif len(candidates) > 0:
-                self._experiment.add_working(candidates[0])
-                to_return = candidates[0]
+            if not self._prefetched:
+                self._logger.debug("No candidate pending; requesting %s from "
+                                   "optimizer.", self._prefetch)
+                candidates = self._optimizer.get_next_candidates(
+                    num_candidates=self._prefetch)
+                self._logger.debug("Got %s", candidates)
+                if candidates:
+                    self._prefetched.extend(candidates)
+            if self._prefetched:
+                to_return = self._prefetched.popleft()
+                self._experiment.add_working(to_return)
         else:
             self._logger.debug("Had at least one pending.")
-            cand = self._experiment.candidates_pending.pop()
+            cand = self._experiment.candidates_pending.popleft()
             self._experiment.add_working(cand)
             to_return = cand
-        self._logger.debug("Returning candidate %s" %str(to_return))
+        self._logger.debug("Returning candidate %s", to_return)
         self._write_state_to_file()
         return to_return
 
@@ -133,6 +240,9 @@ class ExperimentAssistant(object):
         Returns the dictionary describing this EAss' experiment.
 
         Signature is equivalent to Experiment.to_dict()
+        The dictionary is cached until the next update or get_next_candidate
+        call, so polling an unchanged experiment does not convert every
+        candidate again. It must not be changed by the caller.
 
         Returns
         -------
@@ -140,8 +250,10 @@ class ExperimentAssistant(object):
                 The experiment dictionary.
         """
         self._logger.debug("Returning experiment as dict.")
-        exp_dict = self._experiment.to_dict()
-        self._logger.log(5, "Exp_dict is %s" %exp_dict)
+        if self._experiment_dict_cache is None:
+            self._experiment_dict_cache = self._experiment.to_dict()
+        exp_dict = self._experiment_dict_cache
+        self._logger.log(5, "Exp_dict is %s", exp_dict)
         return exp_dict
 
     def update(self, candidate, status="finished"):
@@ -161,52 +273,113 @@ class ExperimentAssistant(object):
             - working: The Candidate is now being worked on by a worker.
 
         """
+        self.update_many([(candidate, status)])
+
+    def update_many(self, updates):
+        """
+        Updates the experiment_assistant with the status of several
+        experiment evaluations at once.
+
+        This is equivalent to calling update for each entry, except that the
+        optimizer is updated (and the state written) only once, after all
+        updates have been applied. Since refitting the optimizer is usually
+        the expensive part, use this when several candidates finish at the
+        same time.
+
+        Parameters
+        ----------
+        updates : list of (Candidate, string) tuples
+            Each entry consists of a candidate and its status, as defined in
+            update.
+
+        Raises
+        ------
+        ValueError :
+            Iff one of the statuses or candidates is invalid. In this case, no
+            update is applied.
+        """
+        for candidate, status in updates:
+            self._check_update(candidate, status)
+
+        self._candidates_cache = None
+        self._experiment_dict_cache = None
+        finished_any = False
+        for candidate, status in updates:
+            self._logger.debug("Got new %s of candidate %s with parameters %s"
+                               " and result %s", status, candidate,
+                               candidate.params, candidate.result)
+            self._status_handlers[status](candidate)
+            if status == "finished":
+                finished_any = True
+
+        if finished_any:
+            self._logger.debug("At least one was finished, updating "
+                               "optimizer.")
+            if self._optimizer.invalidates_on_finish:
+                self._prefetched.clear()
+            # And we rebuild the new optimizer.
+            self._optimizer.update(self._experiment)
+            self._logger.debug("Optimizer updated.")
+        self._write_state_to_file()
+
+    def _add_finished(self, candidate):
+        """
+        Adds candidate as finished to the experiment.
+
+        A candidate without a finite result is marked as failed.
+
+        Parameters
+        ----------
+        candidate : Candidate
+            The finished candidate.
+        """
+        if candidate.result is None or not np.isfinite(candidate.result):
+            candidate.failed = True
+        self._experiment.add_finished(candidate)
+
+    def _check_update(self, candidate, status):
+        """
+        Checks whether candidate and status form a valid update.
+
+        Parameters
+        ----------
+        candidate : Candidate
+            The Candidate object whose status is updated.
+        status : string
+            The new status. Has to be in AVAILABLE_STATUS.
+
+        Raises
+        ------
+        ValueError :
+            Iff status is not in AVAILABLE_STATUS, candidate is no Candidate
+            or candidate is not valid for the experiment.
+        """
         self._logger.debug("Updating experiment assistant with candidate %s,"
-                           "status %s" %(candidate, status))
-        if status not in AVAILABLE_STATUS:
+                           "status %s", candidate, status)
+        if status not in self._status_handlers:
             message = ("status not in %s but %s."
-                             %(str(AVAILABLE_STATUS), str(status)))
+                             %(sorted(AVAILABLE_STATUS), status))
             self._logger.error(message)
             raise ValueError(message)
 
         if not isinstance(candidate, Candidate):
             message = ("candidate %s not a Candidate instance."
-                             %str(candidate))
+                             %(candidate,))
             self._logger.error(message)
             raise ValueError(message)
+        self._experiment._check_candidate(candidate)
 
-        self._logger.debug("Got new %s of candidate %s with parameters %s"
-                         " and result %s", status, candidate, candidate.params,
-                          candidate.result)
-
-        if status == "finished":
-            if (candidate.result is None or not np.isfinite(candidate.result)):
-                candidate.failed = True
-            self._experiment.add_finished(candidate)
-            self._logger.debug("Was finished, updating optimizer.")
-            # And we rebuild the new optimizer.
-            self._optimizer.update(self._experiment)
-            self._logger.debug("Optimizer updated.")
-        elif status == "pausing":
-            self._experiment.add_pausing(candidate)
-        elif status == "working":
-            self._experiment.add_working(candidate)
-        self._write_state_to_file()
-
-    def _write_state_to_file(self):
+    def _write_assistant_state(self):
         """
-        Writes the current state to the specified file.
+        Writes the state of this experiment assistant to file.
 
-        When this is called, it collects the state of this experiment assistant
-        - that is, optimizer_class, optimizer_arguments and write_dir - and
-        writes them to file. It also forces _experiment to write its state to
-        file.
-        All of this only happens if _write_dir is not None - if it is, we will
-        do nothing.
+        The state - that is, optimizer_class, optimizer_arguments and
+        write_dir - does not change after initialization, so this only has to
+        be called once. This only happens if _write_dir is not None.
         """
-        self._logger.debug("Writing experiment assistant status to file %s",
-                           self._write_dir)
-        if self._write_dir is None:
+        self._logger.debug("Writing experiment assistant state to file %s",
+                           self._assistant_state_path)
+        if self._assistant_state_path is None:
             self._logger.debug("No write directory is set; not writing "
                                "anything.")
             return
@@ -217,10 +390,43 @@ class ExperimentAssistant(object):
         state["optimizer_class"] = opt
         state["optimizer_arguments"] = self._optimizer_arguments
         state["write_dir"] = self._write_dir
-        with open(self._write_dir + '/exp_assistant.json', 'w') as outfile:
-            json.dump(state, outfile)
+        write_json(state, self._assistant_state_path)
         self._logger.debug("Writing state %s", state)
+
+    def _write_state_to_file(self):
+        """
+        Registers a change of the experiment, writing it to file every
+        _write_frequency changes.
+
+        The state of the assistant itself is written once on initialization
+        (see _write_assistant_state). This only happens if _write_dir is not
+        None - if it is, we will do nothing.
+        """
+        if self._write_dir is None:
+            self._logger.debug("No write directory is set; not writing "
+                               "anything.")
+            return
+        self._unwritten_changes += 1
+        if self._unwritten_changes < self._write_frequency:
+            self._logger.debug("%s unwritten changes; not writing yet.",
+                               self._unwritten_changes)
+            return
+        self.flush()
+
+    def flush(self):
+        """
+        Writes the current state of the experiment to file.
+
+        This forces _experiment to write its state to file, regardless of
+        how many changes have happened since the last write. Nothing happens
+        if _write_dir is None.
+        """
+        self._logger.debug("Writing experiment status to file %s",
+                           self._write_dir)
+        if self._write_dir is None:
+            return
         self._experiment.write_state_to_file(self._write_dir)
+        self._unwritten_changes = 0
 
     def get_best_candidate(self):
         """
@@ -290,6 +496,10 @@ class ExperimentAssistant(object):
         This internal function returns quality of the results by step.
         This returns an x coordinate, and for each of them a value for the
         currently evaluated result and the best found result.
+        If all finished candidates are plotted, the lists kept by this
+        assistant are returned instead of copies, so they must not be
+        modified.
+
         Returns
         -------
         x: list of ints
@@ -298,56 +508,91 @@ class ExperimentAssistant(object):
             The result of the evaluated candidate during the corresponding step
         step_best: list of floats
             The best result that has been found until then.
+        non_finished_xs: list of ints
+            The steps of the pending and working candidates.
+        non_finished_evals: list
+            The results of the pending and working candidates.
         """
         self._logger.debug("Returning best result per step dicts.")
-        x = []
-        step_evaluation = []
-        step_best = []
-        best_candidate = None
-        if plot_up_to is None:
-            plot_up_to = len(self._experiment.candidates_finished)
-        self._logger.debug("Plotting %s candidates", plot_up_to)
-        x_from = 0
-        for i, e in enumerate(self._experiment.candidates_finished
-                              [:plot_up_to]):
-            x.append(i)
-            if not e.failed:
-                step_evaluation.append(e.result)
-                if self._experiment.better_cand(e, best_candidate):
-                    best_candidate = e
-                    step_best.append(e.result)
-                else:
-                    step_best.append(best_candidate.result)
-            else:
-                step_evaluation.append(float("NaN"))
-                if best_candidate is None:
-                    step_best.append(float("NaN"))
-                else:
-                    step_best.append(best_candidate.result)
-            x_from += 1
-
-        non_finished_evals = []
-        non_finished_xs = []
-
-        for i, e in enumerate(sorted(self._experiment.candidates_pending, key=lambda v: v.generated_time)):
-            x_from += 1
-            non_finished_xs.append(x_from)
-            non_finished_evals.append(e.result)
-
-        for i, e in enumerate(sorted(self._experiment.candidates_working, key=lambda v: v.generated_time)):
-            x_from += 1
-            non_finished_xs.append(x_from)
-            non_finished_evals.append(e.result)
+        self._record_finished_steps()
+        if plot_up_to is None or plot_up_to >= len(self._step_evaluation):
+            x = self._step_x
+            step_evaluation = self._step_evaluation
+            step_best = self._step_best
+        else:
+            x = self._step_x[:plot_up_to]
+            step_evaluation = self._step_evaluation[:plot_up_to]
+            step_best = self._step_best[:plot_up_to]
+        self._logger.debug("Plotting %s candidates", len(step_evaluation))
+
+        by_generation = lambda v: v.generated_time
+        non_finished = (sorted(self._experiment.candidates_pending,
+                               key=by_generation) +
+                        sorted(self._experiment.candidates_working,
+                               key=by_generation))
+        x_from = len(step_evaluation) + 1
+        non_finished_xs = range(x_from, x_from + len(non_finished))
+        non_finished_evals = [e.result for e in non_finished]
 
         self._logger.debug("Returning x: %s, step_eval: %s and step_best %s",
                            x, step_evaluation, step_best)
         return x, step_evaluation, step_best, \
                non_finished_xs, non_finished_evals
 
+    def _record_finished_steps(self):
+        """
+        Extends _step_x, _step_evaluation and _step_best by the candidates
+        finished since the last call.
+
+        The running best of the new candidates is computed in one vectorized
+        pass (see step_utils.running_best), so the per step data does not
+        have to be recomputed from scratch for every plot. Failed candidates
+        are NaN and are ignored.
+        If a finished candidate has been removed (for example by finishing it
+        again), the lists are rebuilt from scratch.
+        """
+        if self._experiment.finished_removals != self._step_removals:
+            self._reset_steps()
+        finished = self._experiment.candidates_finished
+        if len(finished) == len(self._step_evaluation):
+            # Nothing finished since the last call; avoids copying anything.
+            return
+        new_finished = finished[len(self._step_evaluation):]
+        results = np.fromiter(
+            (float("NaN") if e.failed or e.result is None else e.result
+             for e in new_finished),
+            dtype=np.float64, count=len(new_finished))
+        if self._step_best:
+            previous_best = self._step_best[-1]
+        else:
+            previous_best = float("NaN")
+        step_best = running_best(results,
+                                 self._experiment.minimization_problem,
+                                 previous_best)
+        self._step_x.extend(range(len(self._step_x),
+                                  len(self._step_x) + len(new_finished)))
+        self._step_evaluation.extend(results.tolist())
+        self._step_best.extend(step_best.tolist())
+
+    def _reset_steps(self):
+        """
+        Empties the per step lists.
+
+        New lists are created instead of clearing the old ones, since these
+        may have been returned by _best_result_per_step_data.
+        """
+        self._step_x = []
+        self._step_evaluation = []
+        self._step_best = []
+        self._step_removals = self._experiment.finished_removals
+
     def get_candidates(self):
         """
         Returns the candidates of this experiment in a dict.
 
+        The dictionary is cached until the next update or get_next_candidate
+        call, so it must not be changed by the caller.
+
         Returns
         -------
         result : dict
@@ -355,9 +600,12 @@ class ExperimentAssistant(object):
             working, with the corresponding candidates.
         """
         self._logger.debug("Returning candidates of exp_ass.")
-        result = {"finished": self._experiment.candidates_finished,
-                  "pending": self._experiment.candidates_pending,
-                  "working": self._experiment.candidates_working}
+        if self._candidates_cache is None:
+            self._candidates_cache = {
+                "finished": self._experiment.candidates_finished,
+                "pending": list(self._experiment.candidates_pending),
+                "working": self._experiment.candidates_working}
+        result = self._candidates_cache
         self._logger.debug("Candidates are %s", result)
         return result
 
@@ -369,7 +617,8 @@ class ExperimentAssistant(object):
         Parameters
         ----------
         ax : None or matplotlib.Axes, optional
-            The ax to update. If None, a new figure will be created.
+            The ax to update. If None, this assistant's own figure is cleared
+            and drawn to. It is created on the first such call.
         color : string, optional
             A string representing a pyplot color.
         plot_min : float, optional
@@ -378,39 +627,34 @@ class ExperimentAssistant(object):
             The biggest value to plot on the y axis.
         Returns
         -------
-        ax: plt.Axes
-            The Axes containing the results over the steps.
+        fig : plt.figure
+            The figure containing the results over the steps.
         """
         self._logger.debug("Plotting result per step. ax %s, colors %s, "
                            "plot_min %s, plot_max %s", ax, color, plot_min,
                            plot_max)
+        # Imported here, since importing pyplot is slow and only needed for
+        # plotting.
+        from apsis.utilities.plot_utils import (plot_lists, create_figure,
+                                                reset_ax)
         plots = self._best_result_per_step_dicts(color, cutoff_percentage=0.5)
-        if self._experiment.minimization_problem:
-            legend_loc = 'upper right'
-        else:
-            legend_loc = 'upper left'
-        self._logger.debug("Setting legend to %s LOC", legend_loc)
-        plot_options = {
-            "legend_loc": legend_loc,
-            "x_label": "steps",
-            "y_label": "result",
-            "title": "Plot of %s result over the steps."
-                     % (str(self._experiment.name)),
-            "minimizing": self._experiment.minimization_problem
-        }
-        self._logger.debug("Plot options are %s", plot_options)
-        fig, ax = plot_lists(plots, ax=ax, fig_options=plot_options,
-                             plot_min=plot_min, plot_max=plot_max)
-
-        return fig
+        if ax is None:
+            if self._plot_figure is None:
+                self._plot_figure, ax = create_figure(self._plot_options)
+            else:
+                ax = reset_ax(self._plot_figure.axes[0], self._plot_options)
+        ax = plot_lists(plots, ax=ax, fig_options=self._plot_options,
+                        plot_min=plot_min, plot_max=plot_max)
+        return ax.figure
 
     def set_exit(self):
         """
         Exits this assistant.
 
-        Currently, all that is done is that the optimizer is exited.
+        The optimizer is exited, and all changes not yet written are flushed.
         """
         self._logger.debug("Exp assistant received exit.")
+        self.flush()
         self._optimizer.exit()
         self._logger.debug("Sent exit to optimizer.")
 
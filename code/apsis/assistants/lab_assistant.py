@@ -7,7 +7,7 @@ import uuid
 
 import apsis.models.experiment as experiment
 from apsis.assistants.experiment_assistant import ExperimentAssistant
-from apsis.utilities.file_utils import ensure_directory_exists
+from apsis.utilities.file_utils import ensure_directory_exists, write_json
 from apsis.utilities.logging_utils import get_logger
 
 # These are the colours supported by the plot.
@@ -26,17 +26,20 @@ class LabAssistant(object):
         The dictionary of experiment assistants this LabAssistant uses.
     _write_dir : String, optional
         The directory to write all the results and plots to.
+    _write_frequency : int
+        The write_frequency each experiment assistant is initialized with.
     _logger : logging.logger
         The logger for this class.
     """
     _exp_assistants = None
 
     _write_dir = None
+    _write_frequency = None
 
     _global_start_date = None
     _logger = None
 
-    def __init__(self, write_dir=None):
+    def __init__(self, write_dir=None, write_frequency=1):
         """
         Initializes the lab assistant.
 
@@ -45,18 +48,24 @@ class LabAssistant(object):
         write_dir: string, optional
             Sets the write directory for the lab assistant. If None (default),
             nothing will be written.
+        write_frequency : int, optional
+            Each experiment is written to file after every write_frequency
+            changes, and when exiting. Default is 1, writing after every
+            change.
         """
         self._logger = get_logger(self)
         self._logger.info("Initializing lab assistant.")
-        self._logger.info("\tWriting results to %s" %write_dir)
+        self._logger.info("\tWriting results to %s", write_dir)
         self._write_dir = write_dir
+        self._write_frequency = write_frequency
 
         self._exp_assistants = {}
 
         reloading_possible = True
         try:
             if self._write_dir:
-                with open(self._write_dir + "/lab_assistant.json", "r"):
+                with open(os.path.join(self._write_dir,
+                                       "lab_assistant.json"), "r"):
                     pass
             else:
                 self._logger.debug("\tReloading impossible due to no "
@@ -71,7 +80,8 @@ class LabAssistant(object):
             self._global_start_date = time.time()
         else:
             # set the correct path.
-            with open(self._write_dir + "/lab_assistant.json", 'r') as infile:
+            with open(os.path.join(self._write_dir, "lab_assistant.json"),
+                      'r') as infile:
                 lab_assistant_json = json.load(infile)
             self._global_start_date = lab_assistant_json["global_start_date"]
             for p in lab_assistant_json["exp_assistants"].values():
@@ -124,10 +134,8 @@ class LabAssistant(object):
         self._logger.debug("Initializing new experiment. Parameters: "
                            "name: %s, optimizer: %s, param_defs: %s, "
                            "exp_id: %s, notes: %s, optimizer_arguments: %s, "
-                           "minimization: %s" %(name, optimizer, param_defs,
-                                                exp_id, notes,
-                                                optimizer_arguments,
-                                                minimization))
+                           "minimization: %s", name, optimizer, param_defs,
+                           exp_id, notes, optimizer_arguments, minimization)
         if exp_id in self._exp_assistants.keys():
             raise ValueError("Already an experiment with id %s registered."
                              %exp_id)
@@ -137,7 +145,7 @@ class LabAssistant(object):
                 exp_id = uuid.uuid4().hex
                 if exp_id not in self._exp_assistants.keys():
                     break
-            self._logger.debug("\tGenerated new exp_id: %s" %exp_id)
+            self._logger.debug("\tGenerated new exp_id: %s", exp_id)
 
         if not self._write_dir:
             exp_assistant_write_directory = None
@@ -145,8 +153,8 @@ class LabAssistant(object):
             exp_assistant_write_directory = os.path.join(self._write_dir +
                                                      "/" + exp_id)
             ensure_directory_exists(exp_assistant_write_directory)
-        self._logger.debug("\tExp_ass directory: %s"
-                           %exp_assistant_write_directory)
+        self._logger.debug("\tExp_ass directory: %s",
+                           exp_assistant_write_directory)
 
         exp = experiment.Experiment(name,
                                     param_defs,
@@ -157,10 +165,11 @@ class LabAssistant(object):
         exp_ass = ExperimentAssistant(optimizer,
                                       experiment=exp,
                                       optimizer_arguments=optimizer_arguments,
-                                      write_dir=exp_assistant_write_directory)
+                                      write_dir=exp_assistant_write_directory,
+                                      write_frequency=self._write_frequency)
         self._exp_assistants[exp_id] = exp_ass
-        self._logger.info("Experiment initialized successfully with id %s."
-                          %exp_id)
+        self._logger.info("Experiment initialized successfully with id %s.",
+                          exp_id)
         self._write_state_to_file()
         return exp_id
 
@@ -179,7 +188,7 @@ class LabAssistant(object):
             The path from which to initialize. This must contain an
             exp_assistant.json as specified.
         """
-        self._logger.debug("Loading Exp_assistant from path %s" %path)
+        self._logger.debug("Loading Exp_assistant from path %s", path)
         with open(path + "/exp_assistant.json", 'r') as infile:
             exp_assistant_json = json.load(infile)
 
@@ -189,23 +198,23 @@ class LabAssistant(object):
         ensure_directory_exists(exp_ass_write_dir)
         self._logger.debug("\tLoaded exp_parameters: "
                            "optimizer_class: %s, optimizer_arguments: %s,"
-                           "write_dir: %s" %(optimizer_class,
-                                             optimizer_arguments,
-                                             exp_ass_write_dir))
+                           "write_dir: %s", optimizer_class,
+                           optimizer_arguments, exp_ass_write_dir)
         exp = self._load_experiment(path)
-        self._logger.debug("\tLoaded Experiment. %s" %exp.to_dict())
+        self._logger.debug("\tLoaded Experiment. %s", exp.to_dict())
 
 
         exp_ass = ExperimentAssistant(optimizer_class=optimizer_class,
                                       experiment=exp,
                                       optimizer_arguments=optimizer_arguments,
-                                      write_dir=exp_ass_write_dir)
+                                      write_dir=exp_ass_write_dir,
+                                      write_frequency=self._write_frequency)
 
         if exp_ass.exp_id in self._exp_assistants:
             raise ValueError("Loaded exp_id is duplicated in experiment! id "
                              "is %s" %exp_ass.exp_id)
         self._exp_assistants[exp_ass.exp_id] = exp_ass
-        self._logger.info("Successfully loaded experiment from %s." %path)
+        self._logger.info("Successfully loaded experiment from %s.", path)
 
     def _load_experiment(self, path):
         """
@@ -222,7 +231,7 @@ class LabAssistant(object):
         with open(path + "/experiment.json", 'r') as infile:
             exp_json = json.load(infile)
         exp = experiment.from_dict(exp_json)
-        self._logger.debug("\tLoaded experiment, %s" %exp.to_dict())
+        self._logger.debug("\tLoaded experiment, %s", exp.to_dict())
         return exp
 
 
@@ -234,16 +243,15 @@ class LabAssistant(object):
         dictionary of every experiment assistant, and dump this to
         self._write_dir/lab_assistant.json.
         """
-        self._logger.debug("Writing lab_assistant state to file %s"
-                           %self._write_dir)
+        self._logger.debug("Writing lab_assistant state to file %s",
+                           self._write_dir)
         if not self._write_dir:
             return
         state = {"global_start_date": self._global_start_date,
                 "exp_assistants": {x.exp_id: x.write_dir for x
                                     in self._exp_assistants.values()}}
-        self._logger.debug("\tState is %s" %state)
-        with open(self._write_dir + '/lab_assistant.json', 'w') as outfile:
-            json.dump(state, outfile)
+        self._logger.debug("\tState is %s", state)
+        write_json(state, os.path.join(self._write_dir, 'lab_assistant.json'))
 
     def get_candidates(self, experiment_id):
         """
@@ -260,9 +268,9 @@ class LabAssistant(object):
             A dictionary of three lists with the keys finished, pending and
             working, with the corresponding candidates.
         """
-        self._logger.debug("Returning candidates for exp %s" %experiment_id)
+        self._logger.debug("Returning candidates for exp %s", experiment_id)
         candidates = self._exp_assistants[experiment_id].get_candidates()
-        self._logger.debug("\tCandidates are %s" %candidates)
+        self._logger.debug("\tCandidates are %s", candidates)
         return candidates
 
     def get_next_candidate(self, experiment_id):
@@ -280,9 +288,9 @@ class LabAssistant(object):
             The Candidate object that should be evaluated next. May be None,
             which is equivalent to no candidate generated.
         """
-        self._logger.debug("Returning next candidate for id %s" %experiment_id)
+        self._logger.debug("Returning next candidate for id %s", experiment_id)
         next_cand = self._exp_assistants[experiment_id].get_next_candidate()
-        self._logger.debug("\tNext candidate is %s" %next_cand)
+        self._logger.debug("\tNext candidate is %s", next_cand)
         return next_cand
 
     def get_best_candidate(self, experiment_id):
@@ -300,9 +308,9 @@ class LabAssistant(object):
             The Candidate object that has performed best. May be None,
             which is equivalent to no candidate being evaluated.
         """
-        self._logger.debug("Returning best candidate for id %s" %experiment_id)
+        self._logger.debug("Returning best candidate for id %s", experiment_id)
         best_cand = self._exp_assistants[experiment_id].get_best_candidate()
-        self._logger.debug("\tBest candidate is %s" %best_cand)
+        self._logger.debug("\tBest candidate is %s", best_cand)
         return best_cand
 
     def update(self, experiment_id, status, candidate):
@@ -325,10 +333,27 @@ class LabAssistant(object):
 
         """
         self._logger.debug("Updating exp_id %s with candidate %s with status"
-                           "%s." %(experiment_id, candidate, status))
+                           "%s.", experiment_id, candidate, status)
         self._exp_assistants[experiment_id].update(status=status,
                                                          candidate=candidate)
 
+    def update_many(self, experiment_id, updates):
+        """
+        Updates the specified experiment with several evaluation statuses at
+        once.
+
+        Parameters
+        ----------
+        experiment_id : string
+            The id of the experiment to update.
+        updates : list of (Candidate, string) tuples
+            Each entry consists of a candidate and its status. See update for
+            the possible statuses.
+        """
+        self._logger.debug("Updating exp_id %s with %s updates.",
+                           experiment_id, len(updates))
+        self._exp_assistants[experiment_id].update_many(updates)
+
     def get_experiment_as_dict(self, exp_id):
         """
         Returns the specified experiment as dictionary.
@@ -343,9 +368,9 @@ class LabAssistant(object):
         exp_dict : dict
             The experiment dictionary as defined by Experiment.to_dict().
         """
-        self._logger.debug("Returning experiment %s as dict." %exp_id)
+        self._logger.debug("Returning experiment %s as dict.", exp_id)
         exp_dict = self._exp_assistants[exp_id].get_experiment_as_dict()
-        self._logger.debug("\tDict is %s" %exp_dict)
+        self._logger.debug("\tDict is %s", exp_dict)
         return exp_dict
 
     def get_plot_result_per_step(self, exp_id):
@@ -362,10 +387,10 @@ class LabAssistant(object):
         fig : matplotlib.figure
             The figure containing the result of each step.
         """
-        self._logger.debug("Returning plot of results per step for %s."
-                           %exp_id)
+        self._logger.debug("Returning plot of results per step for %s.",
+                           exp_id)
         fig = self._exp_assistants[exp_id].plot_result_per_step()
-        self._logger.debug("Figure is %s" %fig)
+        self._logger.debug("Figure is %s", fig)
         return fig
 
 
@@ -383,11 +408,11 @@ class LabAssistant(object):
         contains : bool
             True iff this lab assistant contains an experiment with this id.
         """
-        self._logger.debug("Testing whether this contains id %s" %exp_id)
+        self._logger.debug("Testing whether this contains id %s", exp_id)
         if exp_id in self._exp_assistants:
-            self._logger.debug("exp_id %s is contained." %exp_id)
+            self._logger.debug("exp_id %s is contained.", exp_id)
             return True
-        self._logger.debug("exp_id %s is not contained." %exp_id)
+        self._logger.debug("exp_id %s is not contained.", exp_id)
         return False
 
     def get_ids(self):
@@ -401,7 +426,7 @@ class LabAssistant(object):
         """
         self._logger.debug("Requested all exp_ids.")
         exp_ids = self._exp_assistants.keys()
-        self._logger.debug("All exp_ids: %s" %exp_ids)
+        self._logger.debug("All exp_ids: %s", exp_ids)
         return exp_ids
 
     def set_exit(self):
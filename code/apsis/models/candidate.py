@@ -1,5 +1,6 @@
 __author__ = 'Frederik Diehl'
 
+import logging
 import uuid
 from apsis.utilities.logging_utils import get_logger
 import time
@@ -123,15 +124,17 @@ class Candidate(object):
         equality : bool
             True iff other is a Candidate instance and their ids are equal.
         """
-        self._logger.debug("Comparing candidates self (%s) with %s.", self,
-                           other)
         if not isinstance(other, Candidate):
             equality = False
         elif self.cand_id == other.cand_id:
             equality = True
         else:
             equality = False
-        self._logger.debug("Equality: %s", equality)
+        # Candidates are compared on every list lookup, so this is guarded to
+        # cost a single level check when debug logging is off.
+        if self._logger.isEnabledFor(logging.DEBUG):
+            self._logger.debug("Compared candidates self (%s) with %s. "
+                               "Equality: %s", self, other, equality)
         return equality
 
     def __str__(self):
@@ -197,9 +200,7 @@ class Candidate(object):
         """
         if do_logging:
             self._logger.debug("Converting param_def to dict.")
-        d = {}
-        for k in self.params.keys():
-            d[k] = self.params[k]
+        d = dict(self.params)
         if do_logging:
             self._logger.debug("param_def dict is %s", d)
         return d
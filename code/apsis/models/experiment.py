@@ -3,12 +3,15 @@ __author__ = 'Frederik Diehl'
 from apsis.models.candidate import Candidate
 from apsis.models.parameter_definition import ParamDef
 import copy
+import operator
+import os
 import uuid
 import time
 from apsis.utilities.param_def_utilities import dict_to_param_defs
-import json
+from collections import deque
 from apsis.models import candidate
 from apsis.utilities import logging_utils
+from apsis.utilities.file_utils import write_json
 
 
 class Experiment(object):
@@ -28,16 +31,22 @@ class Experiment(object):
         Defines whether the experiment's goal is to find a minimum result - for
         example when evaluating errors - or a maximum result - for example when
         evaluating scores.
-    candidates_pending : list of Candidate instances
+    candidates_pending : deque of Candidate instances
         These Candidate instances have been generated by an optimizer to be
         evaluated at the next possible time, but are not yet assigned to a
-        worker.
+        worker. They are kept in FIFO order, so the candidate waiting longest
+        is the first to be handed out again.
     candidates_working : list of Candidate instances
         These Candidate instances are currently being evaluated by workers.
     candidates_finished : list of Candidate instances
         These Candidate instances have finished evaluated.
     best_candidate : Candidate instance
         The as of yet best Candidate instance found, according to the result.
+    finished_removals : int
+        The number of times a candidate has been removed from
+        candidates_finished. As long as it does not change, candidates are
+        only ever appended to candidates_finished, which allows caching
+        anything derived from it.
     note : string, optional
         The note can be used to add additional human-readable information to
         the experiment.
@@ -57,6 +66,7 @@ class Experiment(object):
     candidates_finished = None
 
     best_candidate = None
+    finished_removals = None
 
     last_update_time = None
 
@@ -67,8 +77,8 @@ class Experiment(object):
         """
         Initializes an Experiment with a certain parameter definition.
 
-        All of the Candidate lists are set to empty lists, representing an
-        experiment with no work done.
+        All of the Candidate lists are set to empty lists (candidates_pending
+        to an empty deque), representing an experiment with no work done.
 
         Parameters
         ----------
@@ -121,8 +131,9 @@ class Experiment(object):
         self.minimization_problem = minimization_problem
 
         self.candidates_finished = []
-        self.candidates_pending = []
+        self.candidates_pending = deque()
         self.candidates_working = []
+        self.finished_removals = 0
 
         self.last_update_time = time.time()
 
@@ -148,18 +159,18 @@ class Experiment(object):
         """
         self._logger.debug("Adding finished candidate %s", candidate)
         self._check_candidate(candidate)
-        if candidate in self.candidates_pending:
-            self.candidates_pending.remove(candidate)
-        if candidate in self.candidates_working:
-            self.candidates_working.remove(candidate)
-        if candidate in self.candidates_finished:
-            self.candidates_finished.remove(candidate)
+        was_finished = self._remove_candidate(candidate)
 
         cur_time = time.time()
         candidate.last_update_time = cur_time
         self.last_update_time = cur_time
         self.candidates_finished.append(candidate)
-        self._update_best()
+        if was_finished:
+            # Its old result may have been the best one.
+            self._update_best()
+        else:
+            # Only the new candidate can replace the current best.
+            self._update_best_with(candidate)
         self._logger.debug("Added finished candidate %s", candidate)
 
     def add_pending(self, candidate):
@@ -182,12 +193,7 @@ class Experiment(object):
         """
         self._logger.debug("Adding pending candidate %s", candidate)
         self._check_candidate(candidate)
-        if candidate in self.candidates_pending:
-            self.candidates_pending.remove(candidate)
-        if candidate in self.candidates_working:
-            self.candidates_working.remove(candidate)
-        if candidate in self.candidates_finished:
-            self.candidates_finished.remove(candidate)
+        was_finished = self._remove_candidate(candidate)
 
         cur_time = time.time()
         candidate.last_update_time = cur_time
@@ -195,7 +201,7 @@ class Experiment(object):
 
         self.candidates_pending.append(candidate)
 
-        self._update_best()
+        self._update_best_on_removal(candidate, was_finished)
         self._logger.debug("Added pending candidate %s", candidate)
 
     def add_working(self, candidate):
@@ -217,19 +223,14 @@ class Experiment(object):
         """
         self._logger.debug("Added working candidate %s", candidate)
         self._check_candidate(candidate)
-        if candidate in self.candidates_pending:
-            self.candidates_pending.remove(candidate)
-        if candidate in self.candidates_working:
-            self.candidates_working.remove(candidate)
-        if candidate in self.candidates_finished:
-            self.candidates_finished.remove(candidate)
+        was_finished = self._remove_candidate(candidate)
 
         cur_time = time.time()
         candidate.last_update_time = cur_time
         self.last_update_time = cur_time
 
         self.candidates_working.append(candidate)
-        self._update_best()
+        self._update_best_on_removal(candidate, was_finished)
         self._logger.debug("Added working candidate %s", candidate)
 
     def add_pausing(self, candidate):
@@ -252,21 +253,14 @@ class Experiment(object):
         """
         self._logger.debug("Pausing candidate %s", candidate)
         self._check_candidate(candidate)
-        if candidate in self.candidates_working:
-            self.candidates_working.remove(candidate)
-        if candidate in self.candidates_pending:
-            self.candidates_pending.remove(candidate)
-        if candidate in self.candidates_working:
-            self.candidates_working.remove(candidate)
-        if candidate in self.candidates_finished:
-            self.candidates_finished.remove(candidate)
+        was_finished = self._remove_candidate(candidate)
 
         cur_time = time.time()
         candidate.last_update_time = cur_time
         self.last_update_time = cur_time
 
         self.candidates_pending.append(candidate)
-        self._update_best()
+        self._update_best_on_removal(candidate, was_finished)
         self._logger.debug("Pausing candidate %s", candidate)
 
     def better_cand(self, candidateA, candidateB):
@@ -395,6 +389,35 @@ class Experiment(object):
         self._logger.debug("Cloned experiment is %s", copied_experiment)
         return copied_experiment
 
+    def _remove_candidate(self, candidate):
+        """
+        Removes candidate from the pending, working and finished candidates.
+
+        Each of them is only scanned once, and none of them is rebuilt.
+
+        Parameters
+        ----------
+        candidate : Candidate
+            The candidate to remove. It does not have to be contained in any
+            of them.
+
+        Returns
+        -------
+        was_finished : bool
+            True iff candidate has been removed from candidates_finished.
+        """
+        for candidates in (self.candidates_pending, self.candidates_working):
+            try:
+                candidates.remove(candidate)
+            except ValueError:
+                pass
+        try:
+            self.candidates_finished.remove(candidate)
+        except ValueError:
+            return False
+        self.finished_removals += 1
+        return True
+
     def _check_candidate(self, cand):
         """
         Checks whether cand is valid for this experiment.
@@ -484,9 +507,14 @@ class Experiment(object):
         param_defs = {}
         for k in self.parameter_definitions:
             param_defs[k] = self.parameter_definitions[k].to_dict()
-        cand_dict_finished = [c.to_dict() for c in self.candidates_finished]
-        cand_dict_pending = [c.to_dict() for c in self.candidates_pending]
-        cand_dict_working = [c.to_dict() for c in self.candidates_working]
+        # The candidates are converted without logging each of them; the
+        # whole dictionary is logged below.
+        cand_dict_finished = [c.to_dict(do_logging=False)
+                              for c in self.candidates_finished]
+        cand_dict_pending = [c.to_dict(do_logging=False)
+                             for c in self.candidates_pending]
+        cand_dict_working = [c.to_dict(do_logging=False)
+                             for c in self.candidates_working]
 
         result_dict = {"name": self.name,
                 "parameter_definitions": param_defs,
@@ -506,19 +534,79 @@ class Experiment(object):
         return result_dict
 
     def _update_best(self):
+        """
+        Recomputes best_candidate from candidates_finished.
+
+        This is equivalent to comparing the candidates via better_cand, but
+        compares the results directly. The candidates have already been
+        checked when they were added, and the comparison operator only
+        depends on minimization_problem.
+        """
         self._logger.debug("Updating best candidate.")
+        better = self._result_comparison()
         best_candidate = None
+        best_result = None
         for c in self.candidates_finished:
-            if self.better_cand(c, best_candidate):
+            if c.failed or c.result is None:
+                continue
+            if best_candidate is None or better(c.result, best_result):
                 best_candidate = c
+                best_result = c.result
                 self._logger.debug("Found new better candidate: %s", c)
         self._logger.debug("Best candidate now %s", best_candidate)
         self.best_candidate = best_candidate
 
+    def _update_best_with(self, candidate):
+        """
+        Updates best_candidate after candidate has been newly finished.
+
+        Parameters
+        ----------
+        candidate : Candidate
+            The newly finished candidate. It must not have replaced a
+            finished candidate, since that may have been the best one.
+        """
+        if candidate.failed or candidate.result is None:
+            return
+        better = self._result_comparison()
+        if (self.best_candidate is None or
+                better(candidate.result, self.best_candidate.result)):
+            self._logger.debug("Found new better candidate: %s", candidate)
+            self.best_candidate = candidate
+
+    def _update_best_on_removal(self, candidate, was_finished):
+        """
+        Updates best_candidate after candidate has left candidates_finished.
+
+        The remaining finished candidates are only scanned if candidate was
+        the best one; otherwise, the best candidate cannot have changed.
+
+        Parameters
+        ----------
+        candidate : Candidate
+            The candidate which has been moved.
+        was_finished : bool
+            Whether candidate has been removed from candidates_finished.
+        """
+        if was_finished and candidate == self.best_candidate:
+            self._update_best()
+
+    def _result_comparison(self):
+        """
+        Returns the operator deciding whether a result is better than another.
+
+        Returns
+        -------
+        better : function
+            operator.lt for minimization problems, operator.gt otherwise.
+        """
+        if self.minimization_problem:
+            return operator.lt
+        return operator.gt
+
     def write_state_to_file(self, path):
         self._logger.debug("Writing stats to %s", path)
-        with open(path + '/experiment.json', 'w') as outfile:
-            json.dump(self.to_dict(), outfile)
+        write_json(self.to_dict(), os.path.join(path, 'experiment.json'))
 
 
 
@@ -549,7 +637,7 @@ def from_dict(d):
     exp = Experiment(name, param_defs, exp_id, notes, minimization_problem)
 
     exp.candidates_finished = cands_finished
-    exp.candidates_pending = cands_pending
+    exp.candidates_pending = deque(cands_pending)
     exp.candidates_working = exp.candidates_working
     exp._update_best()
     exp.last_update_time = d.get("last_update_time", time.time())
@@ -1,7 +1,6 @@
-from abc import ABCMeta, abstractmethod
+from abc import abstractmethod
 import numpy as np
 import scipy.optimize
-from scipy.stats import multivariate_normal
 import random
 from apsis.utilities.logging_utils import get_logger
 
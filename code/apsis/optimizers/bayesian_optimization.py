@@ -186,8 +186,8 @@ class BayesianOptimizer(Optimizer):
                                          kernel_params=self.kernel_params)
         self._logger.debug("Checked kernel. Kernel is %s", self.kernel)
 
-        self._logger.log(5, "Refitting gp with cand %s and results %s"
-                          %(candidate_matrix, results_vector))
+        self._logger.log(5, "Refitting gp with cand %s and results %s",
+                          candidate_matrix, results_vector)
         self.gp = GPy.models.GPRegression(candidate_matrix, results_vector,
                                           self.kernel)
         self.gp.constrain_positive("*")
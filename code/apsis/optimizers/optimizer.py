@@ -1,7 +1,6 @@
 __author__ = 'Frederik Diehl'
 
 from abc import ABCMeta, abstractmethod
-from time import sleep
 from apsis.utilities import logging_utils
 import threading
 import Queue
@@ -23,6 +22,11 @@ class Optimizer(object):
     SUPPORTED_PARAM_TYPES : list
         A list of the supported parameters for this optimizer. Not all
         parameters may be supported by any optimizer.
+    invalidates_on_finish : bool
+        Whether candidates generated before an update should be discarded
+        after it. True by default; optimizers whose candidates do not depend
+        on the results so far can set it to False, so that already generated
+        candidates are still used.
     _experiment : Experiment
         The current state of the experiment. Is used as a base for the the
         optimization.
@@ -30,6 +34,7 @@ class Optimizer(object):
     __metaclass__ = ABCMeta
 
     SUPPORTED_PARAM_TYPES = []
+    invalidates_on_finish = True
 
     _experiment = None
     name = None
@@ -248,8 +253,9 @@ class QueueBasedOptimizer(Optimizer):
             parameters will be assumed.
             Supports the parameter "min_candidates", which sets the number
             of candidates that should be kept ready. Default is 5.
-            Supports the parameter "update_time", which sets the minimum time
-            in seconds between checking for updates. Default is 0.1s
+            Supports the parameter "update_time", which sets the maximum time
+            in seconds to wait for an update before checking whether new
+            candidates are needed. Default is 0.1s
         """
         self._logger = logging_utils.get_logger(self)
         self._logger.debug("Initializing new QueueBasedLogger. "
@@ -260,6 +266,7 @@ class QueueBasedOptimizer(Optimizer):
         self._optimizer_out_queue = Queue.Queue()
         self._optimizer_class = optimizer_class
         self.SUPPORTED_PARAM_TYPES = optimizer_class.SUPPORTED_PARAM_TYPES
+        self.invalidates_on_finish = optimizer_class.invalidates_on_finish
 
         self._logger.debug("Initialized queues. in_queue is %s, out_queue %s",
                            self._optimizer_in_queue, self._optimizer_out_queue)
@@ -323,13 +330,16 @@ class QueueBackend(object):
     _out_queue : Queue
         The queue on which to put the candidates.
     _in_queue : Queue
-        The queue on which to receive the new experiments.
+        The queue on which to receive the experiment updates.
     _optimizer : Optimizer
         The optimizer this abstracts from
     _min_candidates : int
         The minimum numbers of candidates to keep ready.
     _exited : bool
         Whether this process should exit (has seen the exit signal).
+    _update_time : float
+        The maximum time, in seconds, to wait for an update before checking
+        the need for new candidates again.
     """
     _experiment = None
     _out_queue = None
@@ -363,7 +373,7 @@ class QueueBackend(object):
         out_queue : Queue
             The queue on which to put the candidates.
         in_queue : Queue
-            The queue on which to receive the new experiments.
+            The queue on which to receive the experiment updates.
         """
         self._logger = logging_utils.get_logger(self)
         self._logger.debug("Initializing queue backend. Parameters: "
@@ -394,54 +404,80 @@ class QueueBackend(object):
         """
         The run function of this process, checking for new updates.
 
-        Every _update_time seconds, it checks both the necessity of a new
-        generation of candidates, and whether an update is necessary.
+        It waits up to _update_time seconds (but at least 0.01s) for an
+        update, and checks the necessity of a new generation of candidates
+        afterwards. Instead of sleeping, it blocks on the in_queue, so updates
+        and the exit signal are handled as soon as they arrive.
+        Updates are checked first: all updates received in the meantime are
+        coalesced into a single refit, and no candidates are generated from
+        the outdated model only to be discarded by the update.
 
         It also makes sure all queues will be closed.
         """
         try:
+            # Pending updates are applied before generating the first
+            # candidates, but there is no reason to wait for one.
+            timeout = None
             while not self._exited:
+                self._check_update(timeout=timeout)
+                if self._exited:
+                    break
                 self._check_generation()
-                self._check_update()
-                sleep(0.1)
+                # An update_time of 0 must not turn this into a busy loop.
+                timeout = max(self._update_time, 0.01)
         finally:
             pass
 
-    def _check_update(self):
+    def _check_update(self, timeout=None):
         """
         This checks for the availability of updates.
 
         Specifically, it does the following:
         If the in_queue is not empty (that is, there are one or more
         experiments available) it takes the last, most recently added. If
-        one of the elements is "exit", it will exit instead.
+        timeout is given, it waits up to timeout seconds for the first
+        experiment. If one of the elements is "exit", it will exit instead.
         The latest experiment is then used to call the update function of the
         abstracted optimizer.
         Additionally, it will empty the out_queue, since we assume it has more,
-        better information available.
+        better information available - unless the optimizer's
+        invalidates_on_finish is False.
+
+        Parameters
+        ----------
+        timeout : float, optional
+            The maximum time, in seconds, to wait for the first update. If
+            None (the default), it does not wait.
         """
-        new_update = None
-        while not self._in_queue.empty():
-            try:
+        new_experiment = None
+        # empty() is only advisory, so we drain until get_nowait raises.
+        try:
+            if timeout is not None:
+                new_update = self._in_queue.get(timeout=timeout)
+            else:
                 new_update = self._in_queue.get_nowait()
+            while True:
                 self._logger.debug("Received new update: %s", new_update)
-            except Queue.Empty:
-                pass
-            if new_update == "exit":
-                self._logger.debug("Update received was exit.")
-                self._exited = True
-                return
-        if new_update is not None:
+                if new_update == "exit":
+                    self._logger.debug("Update received was exit.")
+                    self._exited = True
+                    return
+                new_experiment = new_update
+                new_update = self._in_queue.get_nowait()
+        except Queue.Empty:
+            pass
+        if new_experiment is None:
+            return
+        if self._optimizer.invalidates_on_finish:
             # clear the out queue. We'll soon have new information.
             try:
-                while not self._out_queue.empty():
+                while True:
                     self._out_queue.get_nowait()
-                self._logger.debug("Cleared out the update queue.")
             except Queue.Empty:
-                pass
-            self._experiment = new_update
-            self._optimizer.update(self._experiment)
-            self._logger.debug("Finished updating.")
+                self._logger.debug("Cleared out the update queue.")
+        self._experiment = new_experiment
+        self._optimizer.update(self._experiment)
+        self._logger.debug("Finished updating.")
 
     def _check_generation(self):
         """
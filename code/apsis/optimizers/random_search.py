@@ -18,8 +18,11 @@ class RandomSearch(Optimizer):
     random_state : randomstate, optional
         The (optional) random state to use. See numpy random states.
 
+    Since the candidates do not depend on any results, they stay valid after
+    updates (invalidates_on_finish is False).
     """
     SUPPORTED_PARAM_TYPES = [NominalParamDef, NumericParamDef]
+    invalidates_on_finish = False
 
     random_state = None
     logger = None
@@ -1,17 +1,11 @@
 __author__ = 'Frederik Diehl'
-import apsis
-from apsis.assistants.lab_assistant import LabAssistant
-import apsis.webservice.REST_interface as REST_interface
 import time
 from apsis.models.parameter_definition import *
-import multiprocessing
-from multiprocessing import reduction
 from apsis_client.apsis_connection import Connection
 
 from apsis.utilities.param_def_utilities import param_defs_to_dict
 
 import apsis.models.parameter_definition as pd
-import time
 
 #from apsis.webservice.REST_interface import app
 
@@ -9,8 +9,13 @@ from nose.tools import assert_equal, assert_items_equal, assert_dict_equal, \
     assert_is_none, assert_raises, raises, assert_greater_equal, \
     assert_less_equal, assert_in, assert_true, assert_false, with_setup
 from apsis.models.parameter_definition import *
+import math
+import os
+import shutil
+import tempfile
 import time
 from apsis.models import experiment
+from apsis.models.candidate import Candidate
 
 
 class TestExperimentAssistant(object):
@@ -84,6 +89,55 @@ class TestExperimentAssistant(object):
         assert_equal(new_cand, cand)
 
 
+    def test_pending_fifo(self):
+        """
+        Tests whether pending candidates are returned oldest first.
+        """
+        cand_one = self.EAss.get_next_candidate()
+        cand_two = self.EAss.get_next_candidate()
+        self.EAss.update(cand_one, "pausing")
+        self.EAss.update(cand_two, "pausing")
+        assert_equal(self.EAss.get_next_candidate(), cand_one)
+        assert_equal(self.EAss.get_next_candidate(), cand_two)
+
+    def test_prefetch(self):
+        exp = experiment.Experiment("test_prefetch", self.param_defs)
+        EAss = ExperimentAssistant("RandomSearch", exp,
+                                   optimizer_arguments={
+                                       "multiprocessing": "none",
+                                       "prefetch": 3})
+        try:
+            cand = EAss.get_next_candidate()
+            assert_equal(len(EAss._prefetched), 2)
+            assert_equal(EAss.get_candidates()["pending"], [])
+            EAss.get_next_candidate()
+            assert_equal(len(EAss._prefetched), 1)
+
+            # Random search candidates stay valid after an update.
+            cand.result = 1
+            EAss.update(cand)
+            assert_equal(len(EAss._prefetched), 1)
+
+            # Otherwise, finishing a candidate discards the prefetched ones.
+            EAss._optimizer.invalidates_on_finish = True
+            EAss.get_next_candidate()
+            cand = EAss.get_next_candidate()
+            assert_equal(len(EAss._prefetched), 2)
+            cand.result = 2
+            EAss.update(cand)
+            assert_equal(len(EAss._prefetched), 0)
+            EAss.get_next_candidate()
+            assert_equal(len(EAss._prefetched), 2)
+        finally:
+            EAss.set_exit()
+
+        for prefetch in [0, -1, 1.5, "3"]:
+            with assert_raises(ValueError):
+                ExperimentAssistant("RandomSearch", exp,
+                                    optimizer_arguments={
+                                        "multiprocessing": "none",
+                                        "prefetch": prefetch})
+
     def test_update(self):
         """
         Tests whether update works.
@@ -106,6 +160,37 @@ class TestExperimentAssistant(object):
         with assert_raises(ValueError):
             self.EAss.update(False)
 
+    def test_update_many(self):
+        """
+        Tests whether several updates can be applied at once, and that
+        invalid updates are rejected before any is applied.
+        """
+        cand_one = self.EAss.get_next_candidate()
+        cand_one.result = 1
+        cand_two = self.EAss.get_next_candidate()
+        cand_two.result = 0
+        cand_three = self.EAss.get_next_candidate()
+
+        with assert_raises(ValueError):
+            self.EAss.update_many([(cand_one, "finished"),
+                                   (cand_two, "No status.")])
+        assert_items_equal(self.EAss._experiment.candidates_finished, [])
+
+        out_of_domain = Candidate({"x": 5, "name": "A"})
+        with assert_raises(ValueError):
+            self.EAss.update_many([(cand_one, "finished"),
+                                   (out_of_domain, "finished")])
+        assert_items_equal(self.EAss._experiment.candidates_finished, [])
+
+        self.EAss.update_many([(cand_one, "finished"),
+                               (cand_two, "finished"),
+                               (cand_three, "pausing")])
+        assert_items_equal(self.EAss._experiment.candidates_finished,
+                           [cand_one, cand_two])
+        assert_items_equal(self.EAss._experiment.candidates_pending,
+                           [cand_three])
+        assert_equal(cand_two, self.EAss.get_best_candidate())
+
     def test_get_best_candidate(self):
         """
         Tests whether get_best_candidate works.
@@ -134,7 +219,58 @@ class TestExperimentAssistant(object):
 
         cand = self.EAss.get_next_candidate()
         cand.result = 2
-        self.EAss.plot_result_per_step()
+        fig = self.EAss.plot_result_per_step()
+        assert_equal(self.EAss.plot_result_per_step(), fig)
+
+    def test_best_result_per_step_data(self):
+        """
+        Tests whether the per step results and the best result so far are
+        correct, including a failed candidate.
+        """
+        for result in [3, 1, 2, None]:
+            cand = self.EAss.get_next_candidate()
+            cand.result = result
+            self.EAss.update(cand)
+        x, step_eval, step_best, _, _ = self.EAss._best_result_per_step_data()
+        assert_equal(list(x), [0, 1, 2, 3])
+        assert_equal(list(step_eval[:3]), [3, 1, 2])
+        assert_true(math.isnan(step_eval[3]))
+        assert_equal(list(step_best), [3, 1, 1, 1])
+
+        x, step_eval, step_best, _, _ = self.EAss._best_result_per_step_data(
+            plot_up_to=2)
+        assert_equal(list(step_best), [3, 1])
+
+        cand = self.EAss.get_next_candidate()
+        cand.result = 0
+        self.EAss.update(cand)
+        x, step_eval, step_best, _, _ = self.EAss._best_result_per_step_data()
+        assert_equal(list(x), [0, 1, 2, 3, 4])
+        assert_equal(list(step_best), [3, 1, 1, 1, 0])
+
+        # Finishing a candidate again moves it to the end.
+        cand.result = 4
+        self.EAss.update(cand)
+        x, step_eval, step_best, _, _ = self.EAss._best_result_per_step_data()
+        assert_equal(list(x), [0, 1, 2, 3, 4])
+        assert_equal(list(step_best), [3, 1, 1, 1, 1])
+
+    def test_best_result_per_step_data_maximization(self):
+        exp = experiment.Experiment("test_maximization", self.param_defs,
+                                    minimization_problem=False)
+        EAss = ExperimentAssistant("RandomSearch", exp,
+                                   optimizer_arguments={
+                                       "multiprocessing": "none"})
+        try:
+            for result in [None, 1, 3, 2]:
+                cand = EAss.get_next_candidate()
+                cand.result = result
+                EAss.update(cand)
+            x, step_eval, step_best, _, _ = EAss._best_result_per_step_data()
+            assert_true(math.isnan(step_best[0]))
+            assert_equal(list(step_best[1:]), [1, 3, 3])
+        finally:
+            EAss.set_exit()
 
     def test_get_candidates_dict(self):
         candidates_dict = self.EAss.get_candidates()
@@ -142,3 +278,47 @@ class TestExperimentAssistant(object):
         for l in ["finished", "pending", "working"]:
             assert_in(l, candidates_dict)
             assert_true(isinstance(candidates_dict[l], list))
+
+    def test_get_candidates_after_update(self):
+        assert_equal(self.EAss.get_candidates()["pending"], [])
+        cand = self.EAss.get_next_candidate()
+        assert_equal(self.EAss.get_candidates()["working"], [cand])
+        self.EAss.update(cand, "pausing")
+        candidates_dict = self.EAss.get_candidates()
+        assert_equal(candidates_dict["pending"], [cand])
+        assert_equal(candidates_dict["working"], [])
+
+    def test_get_experiment_as_dict_after_update(self):
+        exp_dict = self.EAss.get_experiment_as_dict()
+        assert_equal(self.EAss.get_experiment_as_dict(), exp_dict)
+        cand = self.EAss.get_next_candidate()
+        exp_dict = self.EAss.get_experiment_as_dict()
+        assert_equal(len(exp_dict["candidates_working"]), 1)
+        cand.result = 1
+        self.EAss.update(cand)
+        exp_dict = self.EAss.get_experiment_as_dict()
+        assert_equal(len(exp_dict["candidates_working"]), 0)
+        assert_equal(exp_dict["candidates_finished"][0]["result"], 1)
+
+    def test_write_frequency(self):
+        write_dir = tempfile.mkdtemp()
+        try:
+            exp = experiment.Experiment("test_write_frequency",
+                                        self.param_defs, True)
+            EAss = ExperimentAssistant("RandomSearch", exp,
+                                       optimizer_arguments={
+                                           "multiprocessing": "none"},
+                                       write_dir=write_dir,
+                                       write_frequency=2)
+            exp_file = os.path.join(write_dir, "experiment.json")
+            os.remove(exp_file)
+            EAss.get_next_candidate()
+            assert_false(os.path.isfile(exp_file))
+            EAss.get_next_candidate()
+            assert_true(os.path.isfile(exp_file))
+            os.remove(exp_file)
+            EAss.get_next_candidate()
+            EAss.set_exit()
+            assert_true(os.path.isfile(exp_file))
+        finally:
+            shutil.rmtree(write_dir)
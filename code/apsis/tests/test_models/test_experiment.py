@@ -75,6 +75,27 @@ class TestExperiment(object):
         with assert_raises(ValueError):
             self.exp.add_finished(False)
 
+    def test_best_candidate(self):
+        cand = Candidate({"x": 1, "name": "A"})
+        cand.result = 2
+        cand2 = Candidate({"x": 0, "name": "B"})
+        cand2.result = 1
+        self.exp.add_finished(cand)
+        assert_equal(self.exp.best_candidate, cand)
+        self.exp.add_finished(cand2)
+        assert_equal(self.exp.best_candidate, cand2)
+
+        # Finishing the best candidate again with a worse result.
+        cand2.result = 3
+        self.exp.add_finished(cand2)
+        assert_equal(self.exp.best_candidate, cand)
+
+        # Moving a finished candidate back only matters if it was the best.
+        self.exp.add_working(cand2)
+        assert_equal(self.exp.best_candidate, cand)
+        self.exp.add_pausing(cand)
+        assert_equal(self.exp.best_candidate, None)
+
     def test_better_cand(self):
         cand = Candidate({"x": 1, "name": "B"})
         cand2 = Candidate({"x": 0, "name": "A"})
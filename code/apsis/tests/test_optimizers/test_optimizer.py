@@ -4,9 +4,12 @@ from apsis.optimizers.optimizer import Optimizer, QueueBasedOptimizer, \
     QueueBackend
 from apsis.models.experiment import Experiment
 from apsis.models.parameter_definition import *
-from nose.tools import assert_raises
+from nose.tools import assert_raises, assert_equal, assert_true, \
+    assert_false
 from apsis.optimizers.random_search import RandomSearch
 from multiprocessing import Queue
+import Queue as thread_queue
+import threading
 import time
 
 class TestOptimizer(object):
@@ -104,5 +107,46 @@ class TestQueueBackend(object):
         time.sleep(0.1)
         self.backend._check_update()
 
+    def test_check_update_coalesces(self):
+        backend = QueueBackend(RandomSearch, self.experiment,
+                               thread_queue.Queue(), thread_queue.Queue())
+        refits = []
+        backend._optimizer.update = refits.append
+        experiments = [Experiment(name="test_coalesce_%i" % i,
+                                  parameter_definitions={
+                                      "x": MinMaxNumericParamDef(0, 1)})
+                       for i in range(3)]
+        for exp in experiments:
+            backend._in_queue.put(exp)
+        backend._check_update()
+        assert_equal(refits, [experiments[-1]])
+        assert_equal(backend._experiment, experiments[-1])
+
+    def test_check_update_waits(self):
+        backend = QueueBackend(RandomSearch, self.experiment,
+                               thread_queue.Queue(), thread_queue.Queue())
+        start = time.time()
+        backend._check_update(timeout=0.05)
+        assert_false(backend._exited)
+        assert_true(time.time() - start >= 0.05)
+
+        # An update arriving while waiting is handled right away.
+        threading.Timer(0.05, backend._in_queue.put, ["exit"]).start()
+        start = time.time()
+        backend._check_update(timeout=10)
+        assert_true(backend._exited)
+        assert_true(time.time() - start < 5)
+
+    def test_run_update_time_zero(self):
+        backend = QueueBackend(RandomSearch, self.experiment,
+                               thread_queue.Queue(), thread_queue.Queue(),
+                               {"update_time": 0})
+        generations = []
+        backend._check_generation = lambda: generations.append(1)
+        threading.Timer(0.1, backend._in_queue.put, ["exit"]).start()
+        backend.run()
+        # Waiting at least 0.01s per iteration, instead of spinning.
+        assert_true(len(generations) < 50)
+
     def test_check_generation(self):
         self.backend._check_generation()
\ No newline at end of file
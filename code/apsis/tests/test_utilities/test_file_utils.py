@@ -0,0 +1,40 @@
+__author__ = 'Frederik Diehl'
+
+from apsis.utilities.file_utils import write_json
+from nose.tools import assert_equal, assert_true
+import json
+import math
+import os
+import shutil
+import tempfile
+
+
+class TestWriteJson(object):
+    tmp_dir = None
+
+    def setup(self):
+        self.tmp_dir = tempfile.mkdtemp()
+
+    def teardown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_write_json(self):
+        obj = {"name": "test", "values": [1, 2.5, None], "nested": {"a": True}}
+        filename = os.path.join(self.tmp_dir, "test.json")
+        write_json(obj, filename)
+        with open(filename, 'r') as infile:
+            assert_equal(json.load(infile), obj)
+
+    def test_overwrite(self):
+        filename = os.path.join(self.tmp_dir, "test.json")
+        write_json({"a": [1, 2, 3, 4, 5, 6]}, filename)
+        write_json({"a": 1}, filename)
+        with open(filename, 'r') as infile:
+            assert_equal(json.load(infile), {"a": 1})
+
+    def test_nan(self):
+        filename = os.path.join(self.tmp_dir, "test.json")
+        write_json({"result": float("NaN")}, filename)
+        with open(filename, 'r') as infile:
+            result = json.load(infile)["result"]
+        assert_true(math.isnan(result))
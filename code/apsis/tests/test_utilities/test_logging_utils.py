@@ -0,0 +1,25 @@
+__author__ = 'Frederik Diehl'
+
+from apsis.utilities.logging_utils import AddInfoClass
+from nose.tools import assert_equal
+import logging
+
+
+class TestAddInfoClass(object):
+
+    def test_disabled_levels_not_processed(self):
+        logger = logging.getLogger("apsis.tests.test_add_info_class")
+        logger.setLevel(logging.WARNING)
+        adapter = AddInfoClass(logger, {"extra_info": "info"})
+        processed = []
+
+        def process(msg, kwargs):
+            processed.append(msg)
+            return msg, kwargs
+        adapter.process = process
+
+        adapter.debug("debug %s", 1)
+        adapter.log(5, "level 5")
+        assert_equal(processed, [])
+        adapter.warning("warning %s", 1)
+        assert_equal(processed, ["warning %s"])
@@ -3,7 +3,8 @@ __author__ = 'Frederik Diehl'
 from apsis.utilities.optimizer_utils import *
 from apsis.models.experiment import Experiment
 from apsis.models.parameter_definition import *
-from nose.tools import assert_is_instance, assert_raises, assert_equal
+from nose.tools import assert_is_instance, assert_raises, assert_equal, \
+    assert_not_in
 import time
 
 class TestOptimizerUtils(object):
@@ -35,4 +36,16 @@ class TestOptimizerUtils(object):
             check_optimizer(RandomSearch, experiment,
                                                {"multiprocessing": "fails"}),
 
-        time.sleep(0.1)
\ No newline at end of file
+        time.sleep(0.1)
+
+    def test_check_optimizer_lazy_import(self):
+        from apsis.optimizers.bayesian_optimization import BayesianOptimizer
+        param_def = {
+            "x": MinMaxNumericParamDef(0, 1)
+        }
+        experiment = Experiment(name="test_optimizer_experiment",
+                                parameter_definitions=param_def)
+        assert_is_instance(check_optimizer("BayOpt", experiment,
+                                           {"multiprocessing": "none"}),
+                           BayesianOptimizer)
+        assert_not_in("BayOpt", AVAILABLE_OPTIMIZERS)
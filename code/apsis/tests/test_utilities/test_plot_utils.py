@@ -0,0 +1,14 @@
+__author__ = 'Frederik Diehl'
+
+from apsis.utilities.plot_utils import _get_y_min_max
+from nose.tools import assert_equal
+
+
+class TestPlotUtils(object):
+
+    def test_get_y_min_max(self):
+        y = [5, float("NaN"), 3, 1, 4, 2]
+        assert_equal(_get_y_min_max([], (1, 1)), (None, None))
+        assert_equal(_get_y_min_max(y, (1, 1)), (1, 5))
+        assert_equal(_get_y_min_max(y, (1, 0.5)), (1, 3))
+        assert_equal(_get_y_min_max(y, (0.5, 1)), (4, 5))
@@ -0,0 +1,23 @@
+__author__ = 'Frederik Diehl'
+
+from apsis.utilities.step_utils import running_best
+from nose.tools import assert_equal, assert_true
+import numpy as np
+
+
+class TestRunningBest(object):
+
+    def setup(self):
+        self.results = np.array([float("NaN"), 3, 1, float("NaN"), 2, 0])
+
+    def test_running_best(self):
+        step_best = running_best(self.results, True)
+        assert_true(np.isnan(step_best[0]))
+        assert_equal(list(step_best[1:]), [3, 1, 1, 1, 0])
+
+        step_best = running_best(self.results, False)
+        assert_equal(list(step_best[1:]), [3, 3, 3, 3, 3])
+
+    def test_initial(self):
+        step_best = running_best(self.results, True, 2)
+        assert_equal(list(step_best), [2, 2, 1, 1, 1, 0])
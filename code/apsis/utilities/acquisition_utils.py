@@ -80,11 +80,12 @@ def create_cand_matrix_vector(experiment, failed_treat):
 
     best_candidate = experiment.candidates_finished[0]
     worst_candidate = experiment.candidates_finished[0]
+    # The experiment already keeps track of its best candidate.
+    if experiment.best_candidate is not None:
+        best_candidate = experiment.best_candidate
 
     for c in experiment.candidates_finished:
         if not c.failed:
-            if experiment.better_cand(c, best_candidate):
-                best_candidate = c
             if experiment.better_cand(worst_candidate, c):
                 worst_candidate = c
 
@@ -1,7 +1,6 @@
 import math
 from apsis.utilities.randomization import check_random_state
 from scipy.stats.distributions import norm
-import numpy as np
 
 def branin_func(x, y, a=1, b=5.1/(4*math.pi**2), c=5/math.pi, r=6, s=10,
                 t=1/(8*math.pi)):
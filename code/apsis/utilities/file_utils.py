@@ -1,4 +1,6 @@
 import os
+import json
+
 
 def ensure_directory_exists(directory):
         """
@@ -10,4 +12,19 @@ def ensure_directory_exists(directory):
             The name of the directory that shall be created if not exists.
         """
         if not os.path.exists(directory):
-                os.makedirs(directory)
\ No newline at end of file
+                os.makedirs(directory)
+
+
+def write_json(obj, filename):
+        """
+        Writes obj as json to filename, replacing any existing content.
+
+        Parameters
+        ----------
+        obj : jsonable object
+            The object to write.
+        filename : String
+            The file to write to. Its directory has to exist.
+        """
+        with open(filename, 'w') as outfile:
+                json.dump(obj, outfile)
@@ -91,5 +91,32 @@ def logging_tests():
 
 
 class AddInfoClass(logging.LoggerAdapter):
+        """
+        Prepends extra_info to every message.
+
+        Python 2's LoggerAdapter processes (and therefore formats) every
+        message before the level is checked. Since candidates log on every
+        comparison, the level is checked first here.
+        """
         def process(self, msg, kwargs):
-            return '[%s] %s' % (self.extra['extra_info'], msg), kwargs
\ No newline at end of file
+            return '[%s] %s' % (self.extra['extra_info'], msg), kwargs
+
+        def log(self, level, msg, *args, **kwargs):
+            if self.isEnabledFor(level):
+                msg, kwargs = self.process(msg, kwargs)
+                self.logger.log(level, msg, *args, **kwargs)
+
+        def debug(self, msg, *args, **kwargs):
+            self.log(logging.DEBUG, msg, *args, **kwargs)
+
+        def info(self, msg, *args, **kwargs):
+            self.log(logging.INFO, msg, *args, **kwargs)
+
+        def warning(self, msg, *args, **kwargs):
+            self.log(logging.WARNING, msg, *args, **kwargs)
+
+        def error(self, msg, *args, **kwargs):
+            self.log(logging.ERROR, msg, *args, **kwargs)
+
+        def critical(self, msg, *args, **kwargs):
+            self.log(logging.CRITICAL, msg, *args, **kwargs)
\ No newline at end of file
@@ -2,11 +2,14 @@ __author__ = 'Frederik Diehl'
 
 from apsis.optimizers.random_search import RandomSearch
 from apsis.optimizers.optimizer import Optimizer, QueueBasedOptimizer
-from apsis.optimizers.bayesian_optimization import BayesianOptimizer
-import numpy as np
+import importlib
 
-AVAILABLE_OPTIMIZERS = {"RandomSearch": RandomSearch,
-                        "BayOpt": BayesianOptimizer}
+AVAILABLE_OPTIMIZERS = {"RandomSearch": RandomSearch}
+
+# Optimizers with heavy dependencies (GPy, and through it matplotlib) are
+# given by their import path, and only imported once they are used.
+_LAZY_OPTIMIZERS = {"BayOpt": "apsis.optimizers.bayesian_optimization."
+                              "BayesianOptimizer"}
 
 def check_optimizer(optimizer, experiment, optimizer_arguments=None):
     """
@@ -16,7 +19,8 @@ def check_optimizer(optimizer, experiment, optimizer_arguments=None):
     it is, it is returned unchanged, all other parameters are ignored. If
     it is a class of optimizer, it will initialize it with experiment and
     optimizer_arguments. If it is a basestring, it will be translated via
-    optimizer_utils.AVAILABLE_OPTIMIZERS, then initialized.
+    optimizer_utils.AVAILABLE_OPTIMIZERS (or, for optimizers with heavy
+    dependencies, imported on first use), then initialized.
 
     Parameters
     ----------
@@ -41,8 +45,9 @@ def check_optimizer(optimizer, experiment, optimizer_arguments=None):
     ------
     ValueError
         If the optimizer is a string, and one cannot find it in
-        AVAILABLE_OPTIMIZERS. If not an optimizer subclass. If the
-        multiprocessing argument is not an acceptable value.
+        AVAILABLE_OPTIMIZERS or the lazily imported optimizers. If not an
+        optimizer subclass. If the multiprocessing argument is not an
+        acceptable value.
 
     """
     if optimizer_arguments is None:
@@ -52,12 +57,15 @@ def check_optimizer(optimizer, experiment, optimizer_arguments=None):
         return optimizer
 
     if isinstance(optimizer, basestring):
-        try:
+        if optimizer in AVAILABLE_OPTIMIZERS:
             optimizer = AVAILABLE_OPTIMIZERS[optimizer]
-        except:
+        elif optimizer in _LAZY_OPTIMIZERS:
+            optimizer = _import_optimizer(_LAZY_OPTIMIZERS[optimizer])
+        else:
             raise ValueError("No corresponding optimizer found for %s. "
                              "Optimizer must be in %s" %(
-                str(optimizer), AVAILABLE_OPTIMIZERS.keys()))
+                str(optimizer),
+                AVAILABLE_OPTIMIZERS.keys() + _LAZY_OPTIMIZERS.keys()))
 
     if not issubclass(optimizer, Optimizer):
         raise ValueError("%s is of type %s, not Optimizer type."
@@ -70,4 +78,23 @@ def check_optimizer(optimizer, experiment, optimizer_arguments=None):
     else:
         raise ValueError("%s is not supported as a multi-architecture "
                          "parameter. Currently supported are %s" %(
-            multi_architecture, ["none", "queue"]))
\ No newline at end of file
+            multi_architecture, ["none", "queue"]))
+
+
+def _import_optimizer(path):
+    """
+    Imports an optimizer class given by its import path.
+
+    Parameters
+    ----------
+    path : string
+        The import path of the class, such as
+        "apsis.optimizers.random_search.RandomSearch".
+
+    Returns
+    -------
+    optimizer : optimizer class
+        The imported class.
+    """
+    module_name, class_name = path.rsplit(".", 1)
+    return getattr(importlib.import_module(module_name), class_name)
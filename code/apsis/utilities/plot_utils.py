@@ -3,6 +3,7 @@ import matplotlib.pyplot as plt
 plt.ioff()
 import random
 import os
+import numpy as np
 from matplotlib.colors import colorConverter
 
 
@@ -153,18 +154,22 @@ def _get_y_min_max(y, plot_at_least):
     max_y_new : float
         The new maximum y value.
     """
-    if len(y) == 0:
+    y = np.asarray(y, dtype=float)
+    y = y[~np.isnan(y)]
+    if y.size == 0:
         return None, None
-    sorted_y = sorted([x for x in y if str(x) != 'nan'])
+    # Only one order statistic is needed per bound, so np.partition (linear
+    # time) is used instead of sorting all values.
     if plot_at_least[0] == 1:
-        min_y_new = min(y)
+        min_y_new = y.min()
     else:
-        min_y_new = sorted_y[int(plot_at_least[0] * (-len(sorted_y)))]
+        k = int(plot_at_least[0] * (-y.size)) % y.size
+        min_y_new = np.partition(y, k)[k]
     if plot_at_least[1] == 1:
-        max_y_new = max(y)
+        max_y_new = y.max()
     else:
-        max_y_new = sorted_y[min(len(sorted_y)-1, int(plot_at_least[1] *
-                                                      len(sorted_y)))]
+        k = min(y.size - 1, int(plot_at_least[1] * y.size))
+        max_y_new = np.partition(y, k)[k]
 
     return min_y_new, max_y_new
 
@@ -309,13 +314,50 @@ def create_figure(fig_options=None):
     fig : plt.figure
         A new figure with the options as specified in fig_options.
     """
+    fig, ax = plt.subplots()
+    _label_ax(ax, fig_options)
+    return fig, ax
+
+
+def reset_ax(ax, fig_options=None):
+    """
+    Clears an existing ax so it can be plotted to again.
+
+    This is much cheaper than creating a new figure with create_figure.
+
+    Parameters
+    ----------
+    ax : matplotlib.Axes
+        The ax to clear.
+    fig_options : dict, optional
+        The same options as for create_figure.
+
+    Returns
+    -------
+    ax : matplotlib.Axes
+        The cleared ax.
+    """
+    ax.cla()
+    _label_ax(ax, fig_options)
+    return ax
+
+
+def _label_ax(ax, fig_options=None):
+    """
+    Sets the labels and the title of ax as given by fig_options.
+
+    Parameters
+    ----------
+    ax : matplotlib.Axes
+        The ax to label.
+    fig_options : dict, optional
+        The same options as for create_figure.
+    """
     if fig_options is None:
         fig_options = {}
-    fig, ax = plt.subplots()
     ax.set_xlabel(fig_options.get("x_label", ""))
     ax.set_ylabel(fig_options.get("y_label", ""))
     ax.set_title(fig_options.get("title", ""))
-    return fig, ax
 
 
 def _polish_figure(ax, fig_options=None):
@@ -0,0 +1,37 @@
+__author__ = 'Frederik Diehl'
+
+import numpy as np
+
+
+def running_best(results, minimization_problem, initial=float("NaN")):
+    """
+    Returns the best result up to and including each step.
+
+    NaN results (failed candidates) are ignored. Before the first non-NaN
+    result, the running best is initial.
+
+    Parameters
+    ----------
+    results : np.ndarray of float64
+        The results, in order.
+    minimization_problem : bool
+        Whether smaller results are better.
+    initial : float, optional
+        The best result before the first of results. NaN (the default) if
+        there is none.
+
+    Returns
+    -------
+    step_best : np.ndarray of float64
+        The running best, of the same length as results.
+    """
+    if minimization_problem:
+        best_of = np.fmin
+    else:
+        best_of = np.fmax
+    # results is kept intact (it is still needed by the caller), so exactly one
+    # output array is allocated and the initial value is folded in in place.
+    step_best = best_of.accumulate(results)
+    if initial == initial:
+        best_of(step_best, initial, out=step_best)
+    return step_best